@@ -5,12 +5,18 @@
 import base64
 import datetime
 import json
+import math
 import re
 
 import click
 
 from .. import errors
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 def date_to_string_serializer(value):
     """JSON serializer for datetime objects."""
@@ -19,9 +25,41 @@ def date_to_string_serializer(value):
     raise TypeError("Serializing {!r} to JSON not supported.".format(value))
 
 
+def non_finite_floats_to_none(value):
+    """Replace NaN and infinite floats in lists and dictionaries with None."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: non_finite_floats_to_none(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [non_finite_floats_to_none(v) for v in value]
+    return value
+
+
 def click_echo_json(response):
-    """Echo JSON via click.echo."""
-    click.echo(json.dumps(response, indent=2, default=date_to_string_serializer))
+    """Echo JSON via click.echo.
+
+    If the optional orjson package is installed it is used to serialize the
+    response. The output is the same as that of the standard library json
+    module except that non-ASCII characters are not escaped. Either way NaN
+    and infinite floats are written as null so that the output is valid JSON.
+    """
+    if orjson is None:
+        text = json.dumps(
+            non_finite_floats_to_none(response),
+            indent=2,
+            allow_nan=False,
+            default=date_to_string_serializer,
+        )
+    else:
+        text = orjson.dumps(
+            response,
+            default=date_to_string_serializer,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_NON_STR_KEYS,
+        ).decode("utf-8")
+    click.echo(text)
 
 
 def endpoint_url_for_arn(endpoint_arn):
@@ -262,22 +300,31 @@ def mk_repo(prj, repo_name):
 
 
 VALIDATION_REGEXES = {
-    "dataset": r"^(?P<model>[a-zA-Z0-9\-]+)-(?P<date>[0-9]{8})$",
-    "training-job": (
-        r"^(?P<model>[a-zA-Z0-9\-]+)-(?P<major>[0-9]+)-(?P<minor>[0-9]+)"
-        r"(?P<training_suffix>\-dev)?$"
+    "dataset": re.compile(r"\A(?P<model>[a-zA-Z0-9\-]+)-(?P<date>[0-9]{8})\Z"),
+    "training-job": re.compile(
+        r"\A(?P<model>[a-zA-Z0-9\-]+)-(?P<major>[0-9]+)-(?P<minor>[0-9]+)"
+        r"(?P<training_suffix>\-dev)?\Z"
     ),
-    "model": (
-        r"^(?P<model>[a-zA-Z0-9\-]+)-(?P<major>[0-9]+)-(?P<minor>[0-9]+)"
-        r"-(?P<patch>[0-9]+)(?P<model_suffix>\-dev)?$"
+    "model": re.compile(
+        r"\A(?P<model>[a-zA-Z0-9\-]+)-(?P<major>[0-9]+)-(?P<minor>[0-9]+)"
+        r"-(?P<patch>[0-9]+)(?P<model_suffix>\-dev)?\Z"
     ),
-    "endpoint": (
-        r"^(?P<model>[a-zA-Z0-9\-]+)-(?P<major>[0-9]+)-(?P<minor>[0-9]+)"
+    "endpoint": re.compile(
+        r"\A(?P<model>[a-zA-Z0-9\-]+)-(?P<major>[0-9]+)-(?P<minor>[0-9]+)"
         r"-(?P<patch>[0-9]+)"
-        r"(?P<model_suffix>\-dev)?(?P<endpoint_suffix>\-(live|analysis|test))?$"
+        r"(?P<model_suffix>\-dev)?(?P<endpoint_suffix>\-(live|analysis|test))?\Z"
     ),
 }
 
+VALIDATION_MESSAGES = {
+    "dataset": "Dataset names should be in the format <model-name>-YYYYMMDD",
+    "training-job": "Training job names should be in the"
+    " format <model-name>-X-Y-Z-[dev]",
+    "model": "Model names should be in the format <model-name>-X-Y-Z-[dev]",
+    "endpoint": "Endpoint names should be in the"
+    " format <model-name>-X-Y-Z-[dev]-[live|analysis|test]",
+}
+
 
 def validate_name(name, resource):
     """Validate that the name of the SageMaker resource complies with
@@ -289,21 +336,13 @@ def validate_name(name, resource):
         The type of SageMaker resource to validate. One of "dataset",
         "training-job", "model", "endpoint".
     """
-    message_dict = {
-        "dataset": "Dataset names should be in the format <model-name>-YYYYMMDD",
-        "training-job": "Training job names should be in the"
-        " format <model-name>-X-Y-Z-[dev]",
-        "model": "Model names should be in the format <model-name>-X-Y-Z-[dev]",
-        "endpoint": "Endpoint names should be in the"
-        " format <model-name>-X-Y-Z-[dev]-[live|analysis|test]",
-    }
-    if re.match(VALIDATION_REGEXES[resource], name) is None:
-        raise errors.NamingError(message_dict[resource])
+    if VALIDATION_REGEXES[resource].fullmatch(name) is None:
+        raise errors.NamingError(VALIDATION_MESSAGES[resource])
 
 
 def training_job_name_for_model(model_name):
     """Return a default training job name for the given model."""
-    match = re.match(VALIDATION_REGEXES["model"], model_name)
+    match = VALIDATION_REGEXES["model"].fullmatch(model_name)
     if match is None:
         raise errors.NamingError("Invalid model name {!r}".format(model_name))
     grps = match.groupdict()
@@ -312,7 +351,7 @@ def training_job_name_for_model(model_name):
 
 def model_name_for_endpoint(endpoint_name):
     """Return a default model name for the given endpoint."""
-    match = re.match(VALIDATION_REGEXES["endpoint"], endpoint_name)
+    match = VALIDATION_REGEXES["endpoint"].fullmatch(endpoint_name)
     if match is None:
         raise errors.NamingError("Invalid endpoint name {!r}".format(endpoint_name))
     grps = match.groupdict()
@@ -2,8 +2,10 @@
 
 """ ML2P core utilities. """
 
+import concurrent.futures
 import datetime
 import enum
+import functools
 import importlib
 import json
 import logging
@@ -12,13 +14,12 @@ import pathlib
 import shutil
 import sys
 import tarfile
+import threading
+import time
 import urllib.parse
 import uuid
 import warnings
 
-import boto3
-import yaml
-
 from . import __version__ as ml2p_version
 from .errors import LocalEnvError
 
@@ -27,8 +28,12 @@ class ModellingProject:
     """Object for holding CLI context."""
 
     def __init__(self, cfg):
+        import yaml
+
+        # use the libyaml bindings when PyYAML was built with them:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(cfg) as f:
-            self.cfg = yaml.safe_load(f)
+            self.cfg = yaml.load(f, Loader=loader)
         self.project = self.cfg["project"]
         self.s3 = S3URL(self.cfg["s3folder"])
         self.train = ModellingSubCfg(self.cfg, "train")
@@ -79,9 +84,14 @@ class ModellingSubCfg:
 class S3URL:
     """A friendly interface to an S3 URL."""
 
+    __slots__ = ("_s3url", "_s3root", "_prefix", "_url_prefix")
+
     def __init__(self, s3folder):
         self._s3url = urllib.parse.urlparse(s3folder)
         self._s3root = self._s3url.path.strip("/")
+        # the prefixes are fixed, so build them once (handles an empty s3root):
+        self._prefix = (self._s3root + "/").lstrip("/")
+        self._url_prefix = "s3://{}/{}".format(self._s3url.netloc, self._prefix)
 
     def bucket(self):
         """Return the bucket of the S3 URL.
@@ -103,8 +113,7 @@ class S3URL:
         :returns:
             The path with the suffix appended.
         """
-        path = self._s3root + "/" + suffix.lstrip("/")
-        return path.lstrip("/")  # handles empty s3root
+        return self._prefix + suffix.lstrip("/")
 
     def url(self, suffix=""):
         """Return S3 URL followed by a '/' and the given suffix.
@@ -116,7 +125,7 @@ class S3URL:
         :returns:
             The URL with the suffix appended.
         """
-        return "s3://{}/{}".format(self._s3url.netloc, self.path(suffix))
+        return self._url_prefix + suffix.lstrip("/")
 
 
 class SageMakerEnvType(enum.Enum):
@@ -175,6 +184,11 @@ class SageMakerEnv:
 
     def __init__(self, ml_folder, environ=None):
         self._ml_folder = pathlib.Path(ml_folder)
+        # paths are immutable, so build the fixed ones once:
+        self._data_folder = self._ml_folder / "input" / "data"
+        self._model_folder = self._ml_folder / "model"
+        self._rc_path = self._ml_folder / "input" / "config" / "resourceconfig.json"
+        self._failure_path = self._ml_folder / "output" / "failure"
         if environ is None:
             environ = self._get_environ_variables()
         self.env_type = environ["env_type"]
@@ -187,6 +201,7 @@ class SageMakerEnv:
         self.s3 = None
         if environ["s3_url"]:
             self.s3 = S3URL(environ["s3_url"])
+        self._resourceconfig = None
 
     def _get_environ_variables(self):
         environ = {
@@ -208,12 +223,26 @@ class SageMakerEnv:
             environ["env_type"] = self.UNKNOWN
         return environ
 
-    def resourceconfig(self):
-        rc_path = self._ml_folder / "input" / "config" / "resourceconfig.json"
-        if not rc_path.exists():
-            return {}
-        with rc_path.open() as f:
-            return json.load(f)
+    def resourceconfig(self, reload=False):
+        """Return the SageMaker resource configuration.
+
+        :param bool reload:
+            Whether to re-read the configuration from disk rather than returning
+            the previously loaded copy.
+        :rtype: dict
+        :returns:
+            The contents of input/config/resourceconfig.json, or an empty dictionary
+            if the file does not exist.
+
+        The file does not change during the lifetime of a container so it is read
+        at most once per environment unless a reload is requested.
+        """
+        if self._resourceconfig is None or reload:
+            try:
+                self._resourceconfig = json.loads(self._rc_path.read_bytes())
+            except FileNotFoundError:
+                self._resourceconfig = {}
+        return self._resourceconfig
 
     def dataset_folder(self, dataset=None):
         if dataset is None:
@@ -227,17 +256,16 @@ class SageMakerEnv:
                 " used by AWS SageMaker more accurately.",
                 DeprecationWarning,
             )
-        return self._ml_folder / "input" / "data" / dataset
+        return self._data_folder / dataset
 
     def data_channel_folder(self, channel):
-        return self._ml_folder / "input" / "data" / channel
+        return self._data_folder / channel
 
     def model_folder(self):
-        return self._ml_folder / "model"
+        return self._model_folder
 
     def write_failure(self, text):
-        with open(self._ml_folder / "output" / "failure", "w") as f:
-            f.write(text)
+        self._failure_path.write_bytes(text.encode("utf-8"))
 
 
 class LocalEnv(SageMakerEnv):
@@ -320,8 +348,7 @@ class LocalEnv(SageMakerEnv):
                 continue
             local_object = local_dataset / (s3_object.key[len_prefix:].lstrip("/"))
             local_object.parent.mkdir(parents=True, exist_ok=True)
-            with local_object.open("wb") as f:
-                bucket.download_fileobj(s3_object.key, f)
+            bucket.download_file(s3_object.key, str(local_object))
 
     def download_model(self, training_job):
         """Download the given trained model from S3 and unpack it into the local
@@ -344,18 +371,32 @@ class LocalEnv(SageMakerEnv):
             + "/output/model.tar.gz"
         )
 
-        with local_model_tgz.open("wb") as f:
-            bucket.download_fileobj(s3_model_tgz, f)
+        bucket.download_file(s3_model_tgz, str(local_model_tgz))
 
         tf = tarfile.open(local_model_tgz)
         tf.extractall(self.model_folder())
 
 
+def array_to_list_serializer(value):
+    """JSON serializer for array-like objects such as numpy arrays and scalars.
+
+    Objects that provide a .tolist() method are serialized as the result of
+    calling it.
+    """
+    tolist = getattr(value, "tolist", None)
+    if tolist is None:
+        raise TypeError("Serializing {!r} to JSON not supported.".format(value))
+    return tolist()
+
+
+@functools.lru_cache(maxsize=None)
 def import_string(name):
     """Import a class given its absolute name.
 
     :param str name:
         The name of the model, e.g. mypackage.submodule.ModelTrainerClass.
+
+    Results are cached, so resolving the same name again is a dictionary lookup.
     """
     modname, _, classname = name.rpartition(".")
     mod = importlib.import_module(modname)
@@ -375,6 +416,8 @@ class ModelDatasetGenerator:
     """An interface that allows ml2p-docker to generate a dataset within SageMaker."""
 
     def __init__(self, env):
+        import boto3
+
         self.env = env
         self.s3_client = boto3.client("s3")
         self.setup_logging()
@@ -436,11 +479,25 @@ class ModelTrainer:
 class ModelPredictor:
     """An interface that allows ml2p-docker to make predictions from a model within
     SageMaker.
+
+    Sub-classes may set the attribute BATCH_THREADS to the number of threads
+    that .batch_result(...) should use to call .result(...) concurrently. This
+    helps predictors whose .result(...) waits on I/O (e.g. fetching features from
+    a database). By default batch predictions are made one at a time.
     """
 
+    BATCH_THREADS = None
+
     def __init__(self, env):
+        import boto3
+
         self.env = env
         self.s3_client = boto3.client("s3")
+        # the batch executor is created in the process that first uses it, since
+        # its threads do not survive ml2p-docker forking its workers:
+        self._batch_executor = None
+        self._batch_executor_pid = None
+        self._batch_executor_lock = threading.Lock()
         self.setup_logging()
 
     def setup_logging(self):
@@ -453,6 +510,16 @@ class ModelPredictor:
 
         * Load the model (using self.env to determine where to read the model from).
         * Allocate any other resources needed in order to make predictions.
+
+        When serving, ml2p-docker calls this method once in the server's master
+        process before the worker processes are forked. Objects loaded here are
+        shared copy-on-write by all workers, so models should be loaded here and
+        not lazily on the first request. Loading large arrays from memory-mapped
+        files (e.g. numpy.load(..., mmap_mode="r")) keeps their pages shared even
+        when Python reference counting touches the objects that wrap them.
+
+        Resources that cannot be shared across a fork (e.g. open network
+        connections or threads) should be created lazily inside each worker.
         """
         pass
 
@@ -499,7 +566,7 @@ class ModelPredictor:
         return {
             "model_version": self.env.model_version,
             "ml2p_version": ml2p_version,
-            "timestamp": datetime.datetime.utcnow().timestamp(),
+            "timestamp": time.time(),
         }
 
     def result(self, data):
@@ -510,6 +577,11 @@ class ModelPredictor:
         :rtype: dict
         :returns:
             The prediction result as a dictionary.
+
+        Values in the result may be numpy arrays or numpy scalars (or any other
+        object with a .tolist() method). They are converted to JSON lists and
+        numbers when the response is serialized, so there is no need to call
+        .tolist() here.
         """
         raise NotImplementedError("Sub-classes should implement .result(...)")
 
@@ -530,10 +602,17 @@ class ModelPredictor:
         """
         metadata = self.metadata()
         results = self.batch_result(data)
-        predictions = [{"metadata": metadata, "result": result} for result in results]
-        if self.env.record_invokes:
-            for datum, prediction in zip(data, predictions):
-                self.record_invoke(datum, prediction)
+        if not self.env.record_invokes:
+            return {
+                "predictions": [
+                    {"metadata": metadata, "result": result} for result in results
+                ]
+            }
+        predictions = []
+        for datum, result in zip(data, results):
+            prediction = {"metadata": metadata, "result": result}
+            predictions.append(prediction)
+            self.record_invoke(datum, prediction)
         return {"predictions": predictions}
 
     def batch_result(self, data):
@@ -548,8 +627,77 @@ class ModelPredictor:
         This method can be overrided for sub-classes in order to improve
         performance of batch predictions.
         """
+        if self.BATCH_THREADS:
+            return list(self._get_batch_executor().map(self.result, data))
         return [self.result(datum) for datum in data]
 
+    def _get_batch_executor(self):
+        pid = os.getpid()
+        with self._batch_executor_lock:
+            if self._batch_executor is None or self._batch_executor_pid != pid:
+                self._batch_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.BATCH_THREADS
+                )
+                self._batch_executor_pid = pid
+            return self._batch_executor
+
+    def _shutdown_batch_executor(self):
+        """Shut down the threads used by .batch_result(...), if any.
+
+        This is called by ml2p-docker after .teardown() so that sub-classes
+        that override .teardown() do not need to shut the threads down.
+        """
+        with self._batch_executor_lock:
+            if self._batch_executor is not None:
+                self._batch_executor.shutdown()
+                self._batch_executor = None
+
+    def stream_batch_invoke(self, data):
+        """Invokes the model on a batch of input data and returns an iterator over
+        the full result for each instance.
+
+        :param dict data:
+            The batch of input data the model is being invoked with.
+        :rtype: iterator or None
+        :returns:
+            An iterator over the result dictionaries, or None if
+            .stream_batch_result(data) returns None.
+
+        The result dictionaries are the same as those returned by
+        .batch_invoke(...), but each is only created (and recorded) when the
+        iterator reaches it. ml2p-docker uses this to stream batch predictions
+        when it is supported and falls back to .batch_invoke(...) otherwise.
+        """
+        results = self.stream_batch_result(data)
+        if results is None:
+            return None
+        return self._iter_predictions(self.metadata(), data, results)
+
+    def _iter_predictions(self, metadata, data, results):
+        for datum, result in zip(data, results):
+            prediction = {"metadata": metadata, "result": result}
+            if self.env.record_invokes:
+                self.record_invoke(datum, prediction)
+            yield prediction
+
+    def stream_batch_result(self, data):
+        """Make a batch prediction given a batch of input data, one instance at a
+        time.
+
+        :param dict data:
+            The batch of input data to make a prediction from.
+        :rtype: iterator or None
+        :returns:
+            An iterator over the predictions made for each instance of the input
+            data, or None if streaming predictions is not supported.
+
+        By default this method returns None. Sub-classes that can make predictions
+        incrementally may override it (e.g. as a generator) so that large batches
+        are streamed back to the client without holding all of the predictions
+        in memory at once.
+        """
+        return None
+
     def record_invoke_id(self, datum, prediction):
         """Return an id for an invocation record.
 
@@ -586,11 +734,19 @@ class ModelPredictor:
             The prediction returned for datum by this predictor.
         """
         invoke_id = self.record_invoke_id(datum, prediction)
-        record_filename = (
-            "--".join(["{}-{}".format(k, v) for k, v in invoke_id.items()]) + ".json"
-        )
+        if tuple(invoke_id) == ("ts", "uuid"):
+            # fast path for the default invoke id
+            record_filename = "ts-{}--uuid-{}.json".format(
+                invoke_id["ts"], invoke_id["uuid"]
+            )
+        else:
+            record_filename = (
+                "--".join(["{}-{}".format(k, v) for k, v in invoke_id.items()])
+                + ".json"
+            )
         record = {"input": datum, "result": prediction}
-        record_bytes = json.dumps(record).encode("utf-8")
+        record_json = json.dumps(record, default=array_to_list_serializer)
+        record_bytes = record_json.encode("utf-8")
         s3_key = self.env.s3.path(
             "/predictions/{}/{}".format(self.env.model_version, record_filename)
         )
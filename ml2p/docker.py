@@ -4,85 +4,100 @@
     containers.
 """
 
-import atexit
 import collections
+import os
+import signal
+import sys
+import threading
 import traceback
 from functools import update_wrapper
 
 import click
-from flask import request
-from flask_api import FlaskAPI
 
 from . import __version__ as ml2p_version
 from .core import SageMakerEnv, import_string
-from .errors import APIError
 
 
-class ML2PAPI(FlaskAPI):
-    """Improved error handling for ML2P API."""
+def __getattr__(name):
+    # The prediction server lives in ml2p.docker_server so that the training and
+    # dataset commands do not import Flask or gunicorn. Its public names remain
+    # available from this module for backwards compatibility (e.g. ml2p.docker:app).
+    if name in ("app", "ML2PAPI", "ML2PServer"):
+        from . import docker_server
 
-    def __init__(self, *args, **kw):
-        super(ML2PAPI, self).__init__(*args, **kw)
-        # FlaskAPI requires error_handler_spec to have a key for None (i.e. undefined
-        # error) but does not set it itself, so we do so here:
-        self.error_handler_spec.setdefault(None, {})
+        return getattr(docker_server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    def handle_api_exception(self, exc):
-        if not isinstance(exc, APIError):
-            return super(ML2PAPI, self).handle_api_exception(exc)
-        # Enhanced error support for errors raised by the ML2P API:
-        content = {"message": exc.message, "details": exc.details}
-        return self.response_class(content, status=exc.status_code)
 
+def prefetch_files(folder):
+    """Ask the kernel to start reading all files in a folder into the page cache.
 
-app = ML2PAPI(__name__)
+    :param pathlib.Path folder:
+        The folder to prefetch files from.
 
+    This is a no-op on platforms without os.posix_fadvise.
+    """
+    fadvise = getattr(os, "posix_fadvise", None)
+    if fadvise is None:
+        return
+    for path in folder.rglob("*"):
+        if not path.is_file():
+            continue
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
 
-@app.route("/invocations", methods=["POST"])
-def invocations():
-    if "instances" in request.data:
-        response = app.predictor.batch_invoke(request.data["instances"])
-    else:
-        response = app.predictor.invoke(request.data)
-    return response
 
+def renew_s3_client(predictor):
+    """Give a predictor a new S3 client.
 
-@app.route("/execution-parameters", methods=["GET"])
-def execution_parameters():
-    return {
-        "MaxConcurrentTransforms": 1,
-        "BatchStrategy": "MULTI_RECORD",
-        "MaxPayloadInMB": 6,
-    }
+    :param ModelPredictor predictor:
+        The predictor whose S3 client to replace.
 
+    boto3 clients and their connection pools are not fork-safe, so each gunicorn
+    worker replaces the client it inherited from the master process.
+    """
+    import boto3
 
-@app.route("/ping", methods=["GET"])
-def ping():
-    return {
-        "model_version": app.predictor.env.model_version,
-        "ml2p_version": ml2p_version,
-    }
+    predictor.s3_client = boto3.client("s3")
 
 
-def pass_sagemaker_env(f):
-    """Pass the current SageMakerEnv into a click command."""
+def teardown_predictor(predictor):
+    """Tear down a predictor after serving has ended.
 
-    @click.pass_context
-    def new_func(ctx, *args, **kwargs):
-        return ctx.invoke(f, ctx.obj["env"], *args, **kwargs)
+    :param ModelPredictor predictor:
+        The predictor to tear down.
+
+    The threads used for batch predictions are shut down even if the
+    predictor overrides .teardown() without calling the base method.
+    """
+    try:
+        predictor.teardown()
+    finally:
+        predictor._shutdown_batch_executor()
 
-    return update_wrapper(new_func, f)
+
+def exit_on_sigterm(signum, frame):
+    """Exit cleanly on SIGTERM so that pending finally blocks are run."""
+    sys.exit(0)
 
 
 ML2POptions = collections.namedtuple("ML2POptions", ["model"])
 
 
-def pass_ml2p_docker_options(f):
-    """Pass the group options into a click command."""
+def pass_ml2p_docker_context(f):
+    """Pass the group options and the current SageMakerEnv into a click command."""
 
     @click.pass_context
     def new_func(ctx, *args, **kwargs):
-        return ctx.invoke(f, ctx.obj["opt"], *args, **kwargs)
+        return ctx.invoke(f, ctx.obj["opt"], ctx.obj["env"], *args, **kwargs)
 
     return update_wrapper(new_func, f)
 
@@ -112,8 +127,7 @@ def ml2p_docker(ctx, ml_folder, model):
 
 
 @ml2p_docker.command("train")
-@pass_sagemaker_env
-@pass_ml2p_docker_options
+@pass_ml2p_docker_context
 def train(opt, env):
     """Train the model."""
     if opt.model is None:
@@ -132,28 +146,73 @@ def train(opt, env):
 
 
 @ml2p_docker.command("serve")
-@click.option("--debug/--no-debug", default=False)
-@pass_sagemaker_env
-@pass_ml2p_docker_options
-def serve(opt, env, debug):
-    """Serve the model and make predictions."""
+@click.option(
+    "--debug/--no-debug",
+    default=False,
+    help="Run the single-process Flask development server with debugging enabled.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    envvar="SAGEMAKER_GUNICORN_WORKERS",
+    help="The number of worker processes. Defaults to the number of CPUs.",
+)
+@click.option(
+    "--threads",
+    type=int,
+    default=4,
+    envvar="SAGEMAKER_GUNICORN_THREADS",
+    help="The number of request threads per worker process.",
+)
+@pass_ml2p_docker_context
+def serve(opt, env, debug, workers, threads):
+    """Serve the model and make predictions.
+
+    The model is set up once before the gunicorn worker processes are forked,
+    so the workers share the loaded model. Each worker then creates its own S3
+    client, since boto3 clients are not fork-safe. On shutdown (SageMaker sends
+    SIGTERM) gunicorn lets in-flight requests finish and the model is then torn
+    down once in the master process.
+    """
     if opt.model is None:
         raise click.UsageError(
             "The global parameter --model must either be given when calling the serve"
             " command or --model-type must be given when creating the model."
         )
+    from .docker_server import ML2PServer, app
+
     click.echo(f"Starting server for model version {env.model_version}.")
+    # warm the page cache with the model files while the predictor is created:
+    threading.Thread(
+        target=prefetch_files, args=(env.model_folder(),), daemon=True
+    ).start()
     predictor = opt.model().predictor(env)
     predictor.setup()
     app.predictor = predictor
-    atexit.register(predictor.teardown)
-    app.run(host="0.0.0.0", port=8080, debug=debug)
+    if debug:
+        signal.signal(signal.SIGTERM, exit_on_sigterm)
+        try:
+            app.run(host="0.0.0.0", port=8080, debug=debug)
+        finally:
+            teardown_predictor(predictor)
+    else:
+        options = {
+            "bind": "0.0.0.0:8080",
+            "workers": workers or os.cpu_count() or 1,
+            "worker_class": "gthread",
+            "threads": threads,
+            "preload_app": True,
+            "post_fork": lambda server, worker: renew_s3_client(predictor),
+            # on_exit runs only in the master, after the workers have stopped:
+            "on_exit": lambda server: teardown_predictor(predictor),
+        }
+        ML2PServer(app, options).run()
     click.echo("Done.")
 
 
 @ml2p_docker.command("generate-dataset")
-@pass_sagemaker_env
-@pass_ml2p_docker_options
+@pass_ml2p_docker_context
 def generate_dataset(opt, env):
     """Generates a dataset for training the model."""
     if opt.model is None:
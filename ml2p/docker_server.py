@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+""" ML2P prediction server for use in SageMaker docker containers.
+"""
+
+import functools
+
+from flask import Flask, request
+from flask.json.provider import DefaultJSONProvider
+from gunicorn.app.base import BaseApplication
+from werkzeug.exceptions import HTTPException
+
+from . import __version__ as ml2p_version
+from .core import array_to_list_serializer
+from .errors import APIError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    from flask_api.exceptions import APIException
+except ImportError:  # pragma: no cover
+    APIException = None
+
+
+class ML2PJSONProvider(DefaultJSONProvider):
+    """JSON provider that also serializes numpy arrays and scalars."""
+
+    @staticmethod
+    def default(o):
+        try:
+            return array_to_list_serializer(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
+
+
+class ML2POrjsonProvider(ML2PJSONProvider):
+    """JSON provider that parses and serializes JSON with orjson.
+
+    This is used instead of ML2PJSONProvider when the optional orjson package
+    is installed. orjson serializes numpy arrays natively and dates are passed
+    to ML2PJSONProvider.default, so they are still serialized as HTTP dates.
+    Unlike ML2PJSONProvider, keys are not sorted, non-ASCII characters are not
+    escaped, NaN and infinite floats are serialized as null and floats use
+    orjson's formatting (e.g. 1e16 rather than 1e+16).
+    """
+
+    def dumps(self, obj, **kwargs):
+        return self._dumps(obj, 0).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self._dumps(obj, orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _dumps(self, obj, option):
+        option |= (
+            orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+class ML2PAPI(Flask):
+    """A plain Flask application with JSON error responses for the ML2P API."""
+
+    json_provider_class = ML2PJSONProvider if orjson is None else ML2POrjsonProvider
+
+    def __init__(self, *args, **kwargs):
+        super(ML2PAPI, self).__init__(*args, **kwargs)
+        # Flask finds handlers by looking up the exception's classes in a dict:
+        self.register_error_handler(APIError, self.handle_api_error)
+        self.register_error_handler(HTTPException, self.handle_http_error)
+        if APIException is not None:
+            self.register_error_handler(APIException, self.handle_flask_api_error)
+
+    def handle_api_error(self, exc):
+        # Enhanced error support for errors raised by the ML2P API:
+        return {"message": exc.message, "details": exc.details}, exc.status_code
+
+    def handle_flask_api_error(self, exc):
+        # Flask-API exceptions raised by predictors written for older ML2P:
+        return {"message": exc.detail}, exc.status_code
+
+    def handle_http_error(self, exc):
+        # Flask returns routing redirects and exceptions without a code itself
+        # before it looks for a handler. Headers such as Allow are kept, but the
+        # body is replaced with JSON:
+        headers = [
+            (k, v)
+            for k, v in exc.get_response().headers.items()
+            if k.lower() not in ("content-type", "content-length")
+        ]
+        return {"message": exc.description}, exc.code, headers
+
+
+app = ML2PAPI(__name__)
+
+
+class ML2PServer(BaseApplication):
+    """A gunicorn server for the ML2P API.
+
+    :param app:
+        The WSGI application to serve.
+    :param dict options:
+        Gunicorn settings, e.g. {"bind": "0.0.0.0:8080", "workers": 4}.
+    """
+
+    def __init__(self, app, options=None):
+        self.application = app
+        self.options = options or {}
+        super(ML2PServer, self).__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+@app.route("/invocations", methods=["POST"])
+def invocations():
+    data = request.get_json(force=True, cache=False)
+    if "instances" in data:
+        predictions = app.predictor.stream_batch_invoke(data["instances"])
+        if predictions is not None:
+            return stream_predictions(predictions)
+        response = app.predictor.batch_invoke(data["instances"])
+    else:
+        response = app.predictor.invoke(data)
+    return response
+
+
+def stream_predictions(predictions):
+    """Return a response that streams {"predictions": [...]} as the predictions
+    are made.
+
+    The first prediction is made before the response is returned so that errors
+    raised while making it are reported as error responses. Errors raised by
+    later predictions abort the response part way through.
+    """
+    predictions = iter(predictions)
+    try:
+        first = next(predictions)
+    except StopIteration:
+        return {"predictions": []}
+    body = _iter_predictions_json(first, predictions)
+    return app.response_class(body, mimetype=app.json.mimetype)
+
+
+def _iter_predictions_json(first, predictions):
+    dumps = app.json.dumps
+    yield '{"predictions": [' + dumps(first)
+    for prediction in predictions:
+        yield ", " + dumps(prediction)
+    yield "]}\n"
+
+
+# SageMaker polls these endpoints and their responses never change while the
+# server is running, so their bodies are serialized once.
+EXECUTION_PARAMETERS_BODY = app.json.dumps(
+    {
+        "MaxConcurrentTransforms": 1,
+        "BatchStrategy": "MULTI_RECORD",
+        "MaxPayloadInMB": 6,
+    }
+)
+
+
+@functools.lru_cache(maxsize=None)
+def ping_body(model_version):
+    return app.json.dumps(
+        {
+            "model_version": model_version,
+            "ml2p_version": ml2p_version,
+        }
+    )
+
+
+@app.route("/execution-parameters", methods=["GET"])
+def execution_parameters():
+    return app.response_class(EXECUTION_PARAMETERS_BODY, mimetype=app.json.mimetype)
+
+
+@app.route("/ping", methods=["GET"])
+def ping():
+    body = ping_body(app.predictor.env.model_version)
+    return app.response_class(body, mimetype=app.json.mimetype)
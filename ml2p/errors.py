@@ -3,7 +3,7 @@
 """ ML2P exceptions.
 """
 
-from flask_api.exceptions import APIException
+from werkzeug.exceptions import HTTPException
 
 
 class NamingError(Exception):
@@ -20,7 +20,7 @@ class LocalEnvError(Exception):
     """Raised when an error specific to working with a local environment occurs."""
 
 
-class APIError(APIException):
+class APIError(HTTPException):
     """Raised when an error occurs in the ML2P prediction API.
 
     :param str message:
@@ -35,6 +35,9 @@ class APIError(APIException):
         The HTTP status code associated with the exception.
         Defaults to the `status_code` attribute of the
         exception class, which is 500 for this base exception class.
+
+    The `code` and `description` attributes of werkzeug's HTTPException are
+    set from `status_code` and `message`.
     """
 
     status_code = 500
@@ -46,9 +49,11 @@ class APIError(APIException):
             details = [details]
         if status_code is None:
             status_code = self.__class__.status_code
+        super(APIError, self).__init__(description=message)
         self.message = message
         self.details = details
         self.status_code = status_code
+        self.code = status_code
 
 
 class ServerError(APIError):
@@ -3,23 +3,30 @@ from setuptools import find_packages, setup
 requirements = [
     "boto3",
     "click",
-    "Flask<2.3",
+    "Flask>=2.2,<2.3",
     "werkzeug<3",
-    "Flask-API",
+    "gunicorn",
     "PyYAML",
 ]
 
+orjson_requirements = [
+    "orjson",
+]
+
 def_requirements = [
     "black",
     "bumpversion",
     "coverage",
     "flake8",
+    "Flask-API",
     "isort",
     "pytest",
     "pytest-cov",
+    "pytest-xdist",
     "radon[flake8]",
     "tox",
     "moto",
+    "orjson",
 ]
 
 setup(
@@ -36,7 +43,10 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=requirements,
-    extras_require={"dev": def_requirements},
+    extras_require={
+        "dev": def_requirements,
+        "orjson": orjson_requirements,
+    },
     entry_points={
         "console_scripts": ["ml2p=ml2p.cli:ml2p", "ml2p-docker=ml2p.docker:ml2p_docker"]
     },
@@ -2,20 +2,20 @@
 
 """ Tests for ml2p.cli_commands.dataset. """
 
-import json
+CFG = {
+    "defaults": {
+        "image": "12345.dkr.ecr.us-east-1.amazonaws.com/docker-image:0.0.2",
+        "role": "arn:aws:iam::12345:role/role-name",
+    },
+    "dataset": {"instance_type": "ml.t2.medium", "volume_size": 8},
+}
 
+PROCESSING_JOB_ARN = (
+    "arn:aws:sagemaker:us-east-1:123456789012:processing-job/my-models-ds-20201012"
+)
 
-class TestDataset:
-    def cfg(self):
-        cfg = {
-            "defaults": {
-                "image": "12345.dkr.ecr.us-east-1.amazonaws.com/docker-image:0.0.2",
-                "role": "arn:aws:iam::12345:role/role-name",
-            },
-            "dataset": {"instance_type": "ml.t2.medium", "volume_size": 8},
-        }
-        return cfg
 
+class TestDataset:
     def test_help(self, cli_helper):
         cli_helper.invoke(
             ["dataset", "--help"],
@@ -94,13 +94,9 @@ class TestDataset:
         assert cli_helper.s3_list_objects() == ["my-models/datasets/ds-20201012/b.txt"]
 
     def test_generate(self, cli_helper):
-        cfg = self.cfg()
         cli_helper.s3_create_bucket()
-        generate_output = json.loads(
-            cli_helper.invoke(["dataset", "generate", "ds-20201012"], cfg=cfg)
-        )
-        assert generate_output["ProcessingJobArn"] == (
-            "arn:aws:sagemaker:us-east-1:123456789012"
-            ":processing-job/my-models-ds-20201012"
+        generate_output = cli_helper.invoke_json(
+            ["dataset", "generate", "ds-20201012"], cfg=CFG
         )
+        assert generate_output["ProcessingJobArn"] == PROCESSING_JOB_ARN
         assert generate_output["ResponseMetadata"]["HTTPStatusCode"] == 200
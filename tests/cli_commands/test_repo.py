@@ -2,9 +2,19 @@
 
 """ Tests for ml2p.cli. """
 
+import contextlib
+
 import pytest
 
 
+@contextlib.contextmanager
+def raises_not_implemented(action):
+    """Expect moto to raise NotImplementedError for the given SageMaker action."""
+    with pytest.raises(NotImplementedError) as err:
+        yield
+    assert str(err.value) == f"The {action} action has not been implemented"
+
+
 class TestRepo:
     def repo(self):
         repo = {
@@ -28,39 +38,19 @@ class TestRepo:
         )
 
     def test_list_empty(self, cli_helper):
-        with pytest.raises(NotImplementedError) as err:
+        with raises_not_implemented("list_code_repositories"):
             cli_helper.invoke(["repo", "list"], output_jsonl=[])
-        assert (
-            str(err.value)
-            == "The list_code_repositories action has not been implemented"
-        )
 
     def test_list(self, cli_helper):
         repo = self.repo()
-        with pytest.raises(NotImplementedError) as err:
+        with raises_not_implemented("create_code_repository"):
             cli_helper.sagefaker.create_code_repository(**repo)
-        assert (
-            str(err.value)
-            == "The create_code_repository action has not been implemented"
-        )
-        with pytest.raises(NotImplementedError) as err:
+        with raises_not_implemented("list_code_repositories"):
             cli_helper.invoke(["repo", "list"], output_jsonl=[repo])
-        assert (
-            str(err.value)
-            == "The list_code_repositories action has not been implemented"
-        )
 
     def test_describe(self, cli_helper):
         repo = self.repo()
-        with pytest.raises(NotImplementedError) as err:
+        with raises_not_implemented("create_code_repository"):
             cli_helper.sagefaker.create_code_repository(**repo)
-        assert (
-            str(err.value)
-            == "The create_code_repository action has not been implemented"
-        )
-        with pytest.raises(NotImplementedError) as err:
+        with raises_not_implemented("describe_code_repository"):
             cli_helper.invoke(["repo", "describe", "repo-1234"], output_jsonl=[repo])
-        assert (
-            str(err.value)
-            == "The describe_code_repository action has not been implemented"
-        )
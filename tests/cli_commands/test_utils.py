@@ -4,49 +4,40 @@
 
 import base64
 import datetime
-from unittest.mock import patch
+import pathlib
 
 import click
 import pytest
-from pkg_resources import resource_filename
 
 from ml2p.cli import ModellingProject
 from ml2p.cli_commands import utils
 from ml2p.errors import ConfigError, NamingError
 
+FIXTURE_FILES = pathlib.Path(__file__).parent.parent / "fixture_files"
+ON_START_SCRIPT = (FIXTURE_FILES / "on_start.sh").read_bytes()
+ON_CREATE_SCRIPT = (FIXTURE_FILES / "on_create.sh").read_bytes()
+ON_CREATE_SCRIPT_B64 = base64.b64encode(ON_CREATE_SCRIPT).decode("utf-8")
+
+VPC_CONFIG_FORMAT_ERROR = (
+    "The vpc_config requires a dictionary with keys 'security_groups' and"
+    " 'subnets'. Both the security_groups and subnets should contain lists"
+    " of IDs."
+)
+
 
 @pytest.fixture
 def prj():
-    with patch("boto3.client"):
-        cfg = resource_filename("tests.fixture_files", "ml2p.yml")
-        prj = ModellingProject(cfg)
-    return prj
+    return ModellingProject(str(FIXTURE_FILES / "ml2p.yml"))
 
 
 @pytest.fixture
 def prj_no_vpc():
-    with patch("boto3.client"):
-        cfg_no_vpc = resource_filename("tests.fixture_files", "ml2p-no-vpc.yml")
-        prj_no_vpc = ModellingProject(cfg_no_vpc)
-    return prj_no_vpc
+    return ModellingProject(str(FIXTURE_FILES / "ml2p-no-vpc.yml"))
 
 
 @pytest.fixture
 def prj_multimodel():
-    with patch("boto3.client"):
-        cfg_mm = resource_filename("tests.fixture_files", "ml2p-multimodel.yml")
-        prj_mm = ModellingProject(cfg_mm)
-    return prj_mm
-
-
-def on_start_fixture():
-    with open(resource_filename("tests.fixture_files", "on_start.sh"), "rb") as f:
-        return f.read()
-
-
-def on_create_fixture():
-    with open(resource_filename("tests.fixture_files", "on_create.sh"), "rb") as f:
-        return f.read()
+    return ModellingProject(str(FIXTURE_FILES / "ml2p-multimodel.yml"))
 
 
 class TestCliUtils:
@@ -57,6 +48,14 @@ class TestCliUtils:
             utils.date_to_string_serializer("test")
         assert str(exc_info.value) == "Serializing 'test' to JSON not supported."
 
+    def test_non_finite_floats_to_none(self):
+        value = {"a": [float("nan"), (float("-inf"), 1.5)], "b": "NaN", "c": 2}
+        assert utils.non_finite_floats_to_none(value) == {
+            "a": [None, [None, 1.5]],
+            "b": "NaN",
+            "c": 2,
+        }
+
     def test_click_echo_json(self, capsys):
         response = {"NotebookInstanceName": "notebook-1"}
         utils.click_echo_json(response)
@@ -64,6 +63,39 @@ class TestCliUtils:
             capsys.readouterr().out == '{\n  "NotebookInstanceName": "notebook-1"\n}\n'
         )
 
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "json"])
+    def test_click_echo_json_nested(self, use_orjson, capsys, monkeypatch):
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(utils, "orjson", None)
+        response = {
+            "CreationTime": datetime.datetime(2019, 1, 31, 12, 0, 2),
+            "Tags": [{"Key": "ml2p", "Value": "1"}],
+            "Count": 3,
+            "Empty": {},
+            "Scores": (float("nan"), float("inf"), 0.5),
+        }
+        utils.click_echo_json(response)
+        assert capsys.readouterr().out == (
+            "{\n"
+            '  "CreationTime": "2019-01-31 12:00:02",\n'
+            '  "Tags": [\n'
+            "    {\n"
+            '      "Key": "ml2p",\n'
+            '      "Value": "1"\n'
+            "    }\n"
+            "  ],\n"
+            '  "Count": 3,\n'
+            '  "Empty": {},\n'
+            '  "Scores": [\n'
+            "    null,\n"
+            "    null,\n"
+            "    0.5\n"
+            "  ]\n"
+            "}\n"
+        )
+
     def test_endpoint_url_for_arn(self):
         endpoint_arn = (
             "arn:aws:sagemaker:eu-west-1:123456789012:endpoint/endpoint-20190612"
@@ -85,69 +117,47 @@ class TestCliUtils:
             "Subnets": ["b"],
         }
 
-    def test_mk_vpc_config_non_dict(self, prj):
-        prj.train["vpc_config"] = 5
-        with pytest.raises(ConfigError) as err:
-            utils.mk_vpc_config(prj.train)
-        assert str(err.value) == (
-            "The vpc_config requires a dictionary with keys 'security_groups' and"
-            " 'subnets'. Both the security_groups and subnets should contain lists"
-            " of IDs."
-        )
-
-    def test_mk_vpc_config_missing_security_groups(self, prj):
-        prj.train["vpc_config"] = {"subnets": ["a"]}
-        with pytest.raises(ConfigError) as err:
-            utils.mk_vpc_config(prj.train)
-        assert str(err.value) == (
-            "The vpc_config requires a dictionary with keys 'security_groups' and"
-            " 'subnets'. Both the security_groups and subnets should contain lists"
-            " of IDs."
-        )
-
-    def test_mk_vpc_config_non_list_security_groups(self, prj):
-        prj.train["vpc_config"] = {"security_groups": 5, "subnets": ["a"]}
-        with pytest.raises(ConfigError) as err:
-            utils.mk_vpc_config(prj.train)
-        assert str(err.value) == (
-            "The vpc_config requires a dictionary with keys 'security_groups' and"
-            " 'subnets'. Both the security_groups and subnets should contain lists"
-            " of IDs."
-        )
-
-    def test_mk_vpc_config_empty_security_groups(self, prj):
-        prj.train["vpc_config"] = {"security_groups": [], "subnets": ["a"]}
-        with pytest.raises(ConfigError) as err:
-            utils.mk_vpc_config(prj.train)
-        assert str(err.value) == (
-            "The vpc_config must contain at least one security group id."
-        )
-
-    def test_mk_vpc_config_missing_subnets(self, prj):
-        prj.train["vpc_config"] = {"security_groups": ["a"]}
-        with pytest.raises(ConfigError) as err:
-            utils.mk_vpc_config(prj.train)
-        assert str(err.value) == (
-            "The vpc_config requires a dictionary with keys 'security_groups' and"
-            " 'subnets'. Both the security_groups and subnets should contain lists"
-            " of IDs."
-        )
-
-    def test_mk_vpc_config_non_list_subnets(self, prj):
-        prj.train["vpc_config"] = {"security_groups": ["a"], "subnets": 5}
-        with pytest.raises(ConfigError) as err:
-            utils.mk_vpc_config(prj.train)
-        assert str(err.value) == (
-            "The vpc_config requires a dictionary with keys 'security_groups' and"
-            " 'subnets'. Both the security_groups and subnets should contain lists"
-            " of IDs."
-        )
-
-    def test_mk_vpc_config_empty_subnets(self, prj):
-        prj.train["vpc_config"] = {"security_groups": ["a"], "subnets": []}
+    @pytest.mark.parametrize(
+        "vpc_config, error",
+        [
+            pytest.param(5, VPC_CONFIG_FORMAT_ERROR, id="non-dict"),
+            pytest.param(
+                {"subnets": ["a"]},
+                VPC_CONFIG_FORMAT_ERROR,
+                id="missing-security-groups",
+            ),
+            pytest.param(
+                {"security_groups": 5, "subnets": ["a"]},
+                VPC_CONFIG_FORMAT_ERROR,
+                id="non-list-security-groups",
+            ),
+            pytest.param(
+                {"security_groups": [], "subnets": ["a"]},
+                "The vpc_config must contain at least one security group id.",
+                id="empty-security-groups",
+            ),
+            pytest.param(
+                {"security_groups": ["a"]},
+                VPC_CONFIG_FORMAT_ERROR,
+                id="missing-subnets",
+            ),
+            pytest.param(
+                {"security_groups": ["a"], "subnets": 5},
+                VPC_CONFIG_FORMAT_ERROR,
+                id="non-list-subnets",
+            ),
+            pytest.param(
+                {"security_groups": ["a"], "subnets": []},
+                "The vpc_config must contain at least one subnet id.",
+                id="empty-subnets",
+            ),
+        ],
+    )
+    def test_mk_vpc_config_invalid(self, prj, vpc_config, error):
+        prj.train["vpc_config"] = vpc_config
         with pytest.raises(ConfigError) as err:
             utils.mk_vpc_config(prj.train)
-        assert str(err.value) == ("The vpc_config must contain at least one subnet id.")
+        assert str(err.value) == error
 
     def test_mk_training_job(self, prj):
         training_job_cfg = utils.mk_training_job(prj, "training-job-1", "dataset-1")
@@ -441,14 +451,14 @@ class TestCliUtils:
         notebook_lifecycle_cfg = utils.mk_lifecycle_config(prj, "notebook-1")
         assert (
             base64.b64decode(notebook_lifecycle_cfg["OnStart"][0]["Content"])
-            == on_start_fixture()
+            == ON_START_SCRIPT
         )
 
     def test_mk_lifecycle_config_on_create(self, prj):
         notebook_lifecycle_cfg = utils.mk_lifecycle_config(prj, "notebook-1")
         assert (
             base64.b64decode(notebook_lifecycle_cfg["OnCreate"][0]["Content"])
-            == on_create_fixture()
+            == ON_CREATE_SCRIPT
         )
 
     def test_mk_lifecycle_config(self, prj):
@@ -456,12 +466,8 @@ class TestCliUtils:
         assert notebook_lifecycle_cfg == {
             "NotebookInstanceLifecycleConfigName": "modelling-project-"
             "notebook-1-lifecycle-config",
-            "OnCreate": [
-                {"Content": base64.b64encode(on_create_fixture()).decode("utf-8")}
-            ],
-            "OnStart": [
-                {"Content": base64.b64encode(on_create_fixture()).decode("utf-8")}
-            ],
+            "OnCreate": [{"Content": ON_CREATE_SCRIPT_B64}],
+            "OnStart": [{"Content": ON_CREATE_SCRIPT_B64}],
         }
 
     def test_mk_lifecycle_config_no_onstart_or_oncreate(self, prj_no_vpc):
@@ -544,23 +550,48 @@ class TestNamingValidation:
             " format <model-name>-X-Y-Z-[dev]-[live|analysis|test]"
         )
 
-    def test_naming_validation_compliance(self):
-        utils.validate_name("test-model-20191011", "dataset")
-        utils.validate_name("test-model-0-0-dev", "training-job")
-        utils.validate_name("test-model-0-0", "training-job")
-        utils.validate_name("test-model-10-11-12", "training-job")
-        utils.validate_name("test-model-0-0-0-dev", "model")
-        utils.validate_name("test-model-0-0-0", "model")
-        utils.validate_name("test-model-10-11-12", "model")
-        utils.validate_name("test-model-0-0-0-dev", "endpoint")
-        utils.validate_name("test-model-0-0-0-dev-live", "endpoint")
-        utils.validate_name("test-model-0-0-0-dev-analysis", "endpoint")
-        utils.validate_name("test-model-0-0-0-dev-test", "endpoint")
-        utils.validate_name("test-model-0-0-0", "endpoint")
-        utils.validate_name("test-model-10-11-12", "endpoint")
-        utils.validate_name("test-model-0-0-0-live", "endpoint")
-        utils.validate_name("test-model-0-0-0-analysis", "endpoint")
-        utils.validate_name("test-model-0-0-0-test", "endpoint")
+    @pytest.mark.parametrize(
+        "name, name_type",
+        [
+            ("test-model-20191011", "dataset"),
+            ("test-model-0-0-dev", "training-job"),
+            ("test-model-0-0", "training-job"),
+            ("test-model-10-11-12", "training-job"),
+            ("test-model-0-0-0-dev", "model"),
+            ("test-model-0-0-0", "model"),
+            ("test-model-10-11-12", "model"),
+            ("test-model-0-0-0-dev", "endpoint"),
+            ("test-model-0-0-0-dev-live", "endpoint"),
+            ("test-model-0-0-0-dev-analysis", "endpoint"),
+            ("test-model-0-0-0-dev-test", "endpoint"),
+            ("test-model-0-0-0", "endpoint"),
+            ("test-model-10-11-12", "endpoint"),
+            ("test-model-0-0-0-live", "endpoint"),
+            ("test-model-0-0-0-analysis", "endpoint"),
+            ("test-model-0-0-0-test", "endpoint"),
+        ],
+    )
+    def test_naming_validation_compliance(self, name, name_type):
+        utils.validate_name(name, name_type)
+
+    def test_naming_validation_rejects_trailing_newline(self):
+        with pytest.raises(NamingError):
+            utils.validate_name("test-model-20191011\n", "dataset")
+        with pytest.raises(NamingError):
+            utils.validate_name("test-model-0-0-0-live\n", "endpoint")
+
+    @pytest.mark.parametrize(
+        "name, name_type",
+        [
+            ("test-model-20191011-extra", "dataset"),
+            ("test-model-0-0-dev-extra", "training-job"),
+            ("test-model-0-0-0-dev-extra", "model"),
+            ("my-model-1-2-3-live-extra", "endpoint"),
+            ("test-model-0-0-0-live\n", "endpoint"),
+        ],
+    )
+    def test_validation_regexes_are_anchored(self, name, name_type):
+        assert utils.VALIDATION_REGEXES[name_type].match(name) is None
 
 
 class TestTrainingJobNameForModel:
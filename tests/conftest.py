@@ -3,9 +3,11 @@
 """ Configuration for pytest. """
 
 from .fixtures import (  # noqa: imported so that pytest can find the fixtures
+    botocore_loader,
     data_fixtures,
     fake_utcnow,
     fake_uuid4,
+    moto_mocks,
     moto_session,
     sagemaker,
 )
@@ -6,9 +6,12 @@ import datetime
 import json
 import os
 import pathlib
+import time
 import uuid
 
 import boto3
+import botocore.loaders
+import botocore.session
 import moto
 import pytest
 import yaml
@@ -32,6 +35,7 @@ def fake_utcnow(monkeypatch):
             return datetime.datetime(2019, 1, 31, 12, 0, 2)
 
     monkeypatch.setattr(datetime, "datetime", fake_datetime)
+    monkeypatch.setattr(time, "time", utcnow.timestamp)
     return utcnow
 
 
@@ -137,20 +141,45 @@ def sagemaker(tmpdir, monkeypatch, moto_session):
 
 
 @pytest.fixture
-def moto_session(monkeypatch):
+def moto_mocks(monkeypatch):
+    """Start the moto AWS mocks for a test."""
     for k in list(os.environ):
         if k.startswith("AWS_"):
-            monkeypatch.delitem(os.environ, k)
+            monkeypatch.delenv(k)
     # The environment variables duplicate what happens when an AWS Lambda
     # is executed. See
     # https://docs.aws.amazon.com/lambda/latest/dg/current-supported-versions.html
-    monkeypatch.setitem(os.environ, "AWS_ACCESS_KEY_ID", "dummy-access-key")
-    monkeypatch.setitem(os.environ, "AWS_SECRET_ACCESS_KEY", "dummy-access-key-secret")
-    monkeypatch.setitem(os.environ, "AWS_SECURITY_TOKEN", "dummy-security-token")
-    monkeypatch.setitem(os.environ, "AWS_SESSION_TOKEN", "dummy-session-token")
-    monkeypatch.setitem(os.environ, "AWS_DEFAULT_REGION", MOTO_TEST_REGION)
-    with moto.mock_s3(), moto.mock_ssm(), moto.mock_sagemaker():
-        yield boto3.Session(region_name=MOTO_TEST_REGION)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "dummy-access-key")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "dummy-access-key-secret")
+    monkeypatch.setenv("AWS_SECURITY_TOKEN", "dummy-security-token")
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "dummy-session-token")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", MOTO_TEST_REGION)
+    # starting a mock also resets its backends:
+    with moto.mock_s3() as s3, moto.mock_ssm() as ssm, moto.mock_sagemaker() as sm:
+        yield [s3, ssm, sm]
+
+
+@pytest.fixture(scope="session")
+def botocore_loader():
+    """A botocore data loader shared by all tests, so that each AWS service model
+    is only read and parsed once per test run.
+    """
+    return botocore.loaders.create_loader()
+
+
+@pytest.fixture
+def moto_session(moto_mocks, botocore_loader, monkeypatch):
+    """Return a boto3 session against the moto mocks.
+
+    The session is also installed as boto3's default session for the test.
+    """
+    botocore_session = botocore.session.Session()
+    botocore_session.register_component("data_loader", botocore_loader)
+    session = boto3.Session(
+        botocore_session=botocore_session, region_name=MOTO_TEST_REGION
+    )
+    monkeypatch.setattr(boto3, "DEFAULT_SESSION", session)
+    return session
 
 
 @pytest.fixture()
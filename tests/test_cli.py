@@ -24,6 +24,7 @@ class CLIHelper:
         self._base_cfg = base_cfg
         self.s3 = self._moto_session.client("s3")
         self.sagefaker = moto_session.client("sagemaker")
+        self.runner = CliRunner()
 
     def _apply_base_cfg(self, **kw):
         d = {}
@@ -67,8 +68,7 @@ class CLIHelper:
     ):
         if cfg is None:
             cfg = {}
-        runner = CliRunner()
-        result = runner.invoke(
+        result = self.runner.invoke(
             cli.ml2p,
             ["--cfg", self.cfg(**cfg)] + args,
             catch_exceptions=False,
@@ -80,9 +80,8 @@ class CLIHelper:
             assert result.output.splitlines() == output
             return None
         if output_startswith is not None:
-            assert (
-                result.output.splitlines()[: len(output_startswith)]
-                == output_startswith
+            assert result.output.startswith(
+                "".join(line + "\n" for line in output_startswith)
             )
             return None
         if output_jsonl is not None:
@@ -92,6 +91,19 @@ class CLIHelper:
             return None
         return result.output
 
+    def invoke_json(self, args, **kw):
+        return json.loads(self.invoke(args, **kw))
+
+    def invoke_jsonl(self, args, **kw):
+        output = self.invoke(args, **kw).lstrip()
+        decoder = json.JSONDecoder()
+        items = []
+        while output:
+            item, end = decoder.raw_decode(output)
+            items.append(item)
+            output = output[end:].lstrip()
+        return items
+
 
 @pytest.fixture
 def cli_helper(moto_session, tmp_path):
@@ -2,25 +2,47 @@
 
 """ Tests for ml2p.core. """
 
+import importlib
 import io
+import os
 import pathlib
 import tarfile
+import threading
 
 import pytest
+import yaml
 
 from ml2p import __version__ as ml2p_version
 from ml2p.core import (
     S3URL,
     Model,
     ModelDatasetGenerator,
+    ModellingProject,
     ModellingSubCfg,
     ModelPredictor,
     ModelTrainer,
+    array_to_list_serializer,
     import_string,
 )
 from ml2p.errors import LocalEnvError
 
 
+class TestModellingProject:
+    def test_create(self, tmp_path):
+        cfg = tmp_path / "ml2p.yml"
+        cfg.write_text("project: my-models\ns3folder: s3://my-bucket/my-models/\n")
+        prj = ModellingProject(str(cfg))
+        assert prj.project == "my-models"
+        assert prj.s3.url() == "s3://my-bucket/my-models/"
+
+    def test_create_without_libyaml(self, tmp_path, monkeypatch):
+        monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+        cfg = tmp_path / "ml2p.yml"
+        cfg.write_text("project: my-models\ns3folder: s3://my-bucket/my-models/\n")
+        prj = ModellingProject(str(cfg))
+        assert prj.project == "my-models"
+
+
 def mk_subcfg(defaults="defaults"):
     return ModellingSubCfg(
         {"sub": {"a": 1, "b": "boo"}, "defaults": {"c": 3}}, "sub", defaults=defaults
@@ -71,6 +93,12 @@ class TestS3URL:
     def test_url_with_no_suffix(self):
         assert S3URL("s3://bucket/foo/").url() == "s3://bucket/foo/"
 
+    def test_url_with_empty_root(self):
+        assert S3URL("s3://bucket").url("/bar.txt") == "s3://bucket/bar.txt"
+
+    def test_slots(self):
+        assert not hasattr(S3URL("s3://bucket/foo/"), "__dict__")
+
 
 class TestSageMakerEnvTrain:
     def test_basic_env(self, sagemaker):
@@ -240,6 +268,11 @@ class TestSageMakerEnvLocal:
 
 
 class TestSageMakerEnvGeneric:
+    def test_custom_attributes(self, sagemaker):
+        env = sagemaker.generic()
+        env.extra = "value"
+        assert env.extra == "value"
+
     def test_resourceconfig(self, sagemaker):
         sagemaker.ml_folder.mkdir("input").mkdir("config").join(
             "resourceconfig.json"
@@ -249,6 +282,19 @@ class TestSageMakerEnvGeneric:
     def test_missing_resourceconfig_file(self, sagemaker):
         assert sagemaker.generic().resourceconfig() == {}
 
+    def test_resourceconfig_is_cached(self, sagemaker):
+        rc_file = (
+            sagemaker.ml_folder.mkdir("input")
+            .mkdir("config")
+            .join("resourceconfig.json")
+        )
+        rc_file.write('{"config": "value"}')
+        env = sagemaker.generic()
+        assert env.resourceconfig() == {"config": "value"}
+        rc_file.write('{"config": "changed"}')
+        assert env.resourceconfig() == {"config": "value"}
+        assert env.resourceconfig(reload=True) == {"config": "changed"}
+
     def test_dataset_folder(self, sagemaker):
         with pytest.deprecated_call():
             result = sagemaker.generic().dataset_folder("foo")
@@ -275,12 +321,44 @@ class TestSageMakerEnvGeneric:
         sagemaker.generic().write_failure(text)
         assert failure_path.read() == text
 
+    def test_write_failure_non_ascii(self, sagemaker):
+        failure_path = sagemaker.ml_folder.mkdir("output").join("failure")
+        text = "Oulala! C'est pas très bien!"
+        sagemaker.generic().write_failure(text)
+        assert failure_path.read_binary() == text.encode("utf-8")
+
+
+class FakeArray:
+    """An object that looks like a numpy array for serialization purposes."""
+
+    def __init__(self, values):
+        self._values = values
+
+    def tolist(self):
+        return list(self._values)
+
+
+class TestArrayToListSerializer:
+    def test_array(self):
+        assert array_to_list_serializer(FakeArray((1, 2))) == [1, 2]
+
+    def test_unsupported(self):
+        with pytest.raises(TypeError) as err:
+            array_to_list_serializer(object)
+        assert str(err.value) == ("Serializing <class 'object'> to JSON not supported.")
+
 
 class TestImportString:
     def test_import_string(self):
         cls = import_string("tests.test_core.TestImportString")
         assert cls is TestImportString
 
+    def test_import_string_is_cached(self, monkeypatch):
+        import_string("tests.test_core.TestImportString")
+        monkeypatch.setattr(importlib, "import_module", None)
+        cls = import_string("tests.test_core.TestImportString")
+        assert cls is TestImportString
+
 
 class TestModelTrainer:
     def test_create(self, sagemaker):
@@ -300,6 +378,19 @@ class DummyPredictor(ModelPredictor):
         return {"probability": 0.5, "input": data["input"]}
 
 
+class ThreadedDummyPredictor(DummyPredictor):
+    BATCH_THREADS = 2
+
+    def result(self, data):
+        return dict(super().result(data), thread=threading.get_ident())
+
+
+class StreamingDummyPredictor(DummyPredictor):
+    def stream_batch_result(self, data):
+        for datum in data:
+            yield self.result(datum)
+
+
 class TestModelPredictor:
     def test_create(self, sagemaker):
         env = sagemaker.serve()
@@ -331,6 +422,11 @@ class TestModelPredictor:
             "result": {"probability": 0.5, "input": 1},
         }
 
+    def test_metadata_after_model_version_change(self, sagemaker, fake_utcnow):
+        predictor = DummyPredictor(sagemaker.serve())
+        predictor.env.model_version = "test-model-2.0.0"
+        assert predictor.metadata()["model_version"] == "test-model-2.0.0"
+
     def test_invoke_with_recording(self, sagemaker, fake_utcnow, fake_uuid4):
         predictor = DummyPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
         data = {"input": 1}
@@ -364,6 +460,42 @@ class TestModelPredictor:
             ]
         }
 
+    def test_batch_result_without_threads(self, sagemaker):
+        predictor = DummyPredictor(sagemaker.serve())
+        assert predictor.BATCH_THREADS is None
+        results = predictor.batch_result([{"input": 1}, {"input": 2}])
+        assert results == [
+            {"probability": 0.5, "input": 1},
+            {"probability": 0.5, "input": 2},
+        ]
+        assert predictor._batch_executor is None
+
+    def test_batch_result_with_threads(self, sagemaker):
+        predictor = ThreadedDummyPredictor(sagemaker.serve())
+        data = [{"input": i} for i in range(10)]
+        results = predictor.batch_result(data)
+        assert [r["input"] for r in results] == list(range(10))
+        assert threading.get_ident() not in {r["thread"] for r in results}
+        executor = predictor._batch_executor
+        predictor.batch_result(data)
+        assert predictor._batch_executor is executor
+        predictor.teardown()
+        assert predictor._batch_executor is executor
+        predictor._shutdown_batch_executor()
+        assert predictor._batch_executor is None
+
+    def test_batch_result_with_threads_after_fork(self, sagemaker, monkeypatch):
+        predictor = ThreadedDummyPredictor(sagemaker.serve())
+        predictor.batch_result([{"input": 1}])
+        executor = predictor._batch_executor
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+        results = predictor.batch_result([{"input": 2}])
+        assert [r["input"] for r in results] == [2]
+        assert predictor._batch_executor is not executor
+        assert predictor._batch_executor_pid == -1
+        executor.shutdown()
+        predictor._shutdown_batch_executor()
+
     def test_invoke_batch_with_recording(self, sagemaker, fake_utcnow, fake_uuid4):
         predictor = DummyPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
         data = {"input": 1}
@@ -376,6 +508,35 @@ class TestModelPredictor:
         )
         assert record == {"input": data, "result": prediction["predictions"][0]}
 
+    def test_stream_batch_invoke_not_supported(self, sagemaker):
+        predictor = DummyPredictor(sagemaker.serve())
+        assert predictor.stream_batch_invoke([{"input": 1}]) is None
+
+    def test_stream_batch_invoke(self, sagemaker, fake_utcnow):
+        predictor = StreamingDummyPredictor(sagemaker.serve())
+        data = [{"input": 1}, {"input": 2}]
+        predictions = predictor.stream_batch_invoke(data)
+        assert not isinstance(predictions, list)
+        assert list(predictions) == predictor.batch_invoke(data)["predictions"]
+
+    def test_stream_batch_invoke_with_recording(
+        self, sagemaker, fake_utcnow, fake_uuid4
+    ):
+        predictor = StreamingDummyPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
+        data = {"input": 1}
+        [prediction] = predictor.stream_batch_invoke([data])
+        record = sagemaker.s3_get_object(
+            "foo",
+            "bar/predictions/test-model-1.2.3/"
+            "ts-2019-01-31T12:00:02+00:00--"
+            "uuid-20f803c4-f155-469e-ba96-14caa30af9e1.json",
+        )
+        assert record == {"input": data, "result": prediction}
+
+    def test_stream_batch_result(self, sagemaker):
+        predictor = ModelPredictor(sagemaker.serve())
+        assert predictor.stream_batch_result([{}]) is None
+
     def test_metadata(self, sagemaker, fake_utcnow):
         predictor = ModelPredictor(sagemaker.serve())
         assert predictor.metadata() == {
@@ -406,6 +567,35 @@ class TestModelPredictor:
         )
         assert record == {"input": datum, "result": prediction}
 
+    def test_record_invoke_with_array_result(self, sagemaker, fake_uuid4):
+        predictor = ModelPredictor(sagemaker.serve())
+        datum = {"feature_a": 1}
+        prediction = {"result": {"probabilities": FakeArray([0.25, 0.75])}}
+        predictor.record_invoke_id = lambda datum, prediction: {"uuid": "abc"}
+        predictor.record_invoke(datum, prediction)
+        record = sagemaker.s3_get_object(
+            "foo", "bar/predictions/test-model-1.2.3/uuid-abc.json"
+        )
+        assert record == {
+            "input": datum,
+            "result": {"result": {"probabilities": [0.25, 0.75]}},
+        }
+
+    def test_record_invoke_with_custom_id(self, sagemaker):
+        class CustomIdPredictor(ModelPredictor):
+            def record_invoke_id(self, datum, prediction):
+                return {"ts": "2019-01-31", "id": datum["id"], "uuid": "abc"}
+
+        predictor = CustomIdPredictor(sagemaker.serve())
+        datum = {"id": 7}
+        prediction = {"result": {"probability": 0.5}}
+        predictor.record_invoke(datum, prediction)
+        record = sagemaker.s3_get_object(
+            "foo",
+            "bar/predictions/test-model-1.2.3/ts-2019-01-31--id-7--uuid-abc.json",
+        )
+        assert record == {"input": datum, "result": prediction}
+
     def test_record_invoke_id(self, sagemaker, fake_utcnow, fake_uuid4):
         predictor = ModelPredictor(sagemaker.serve())
         assert predictor.record_invoke_id({"a": "inputs"}, {"b": "outputs"}) == {
@@ -2,21 +2,25 @@
 
 """ Tests for ml2p.docker. """
 
-import atexit
 import collections
 import logging
+import os
 import re
+import signal
 
 import pytest
 from click.testing import CliRunner
 from flask_api.exceptions import APIException
 
 import ml2p.docker
+import ml2p.docker_server
 from ml2p import __version__ as ml2p_version
 from ml2p.core import Model, ModelDatasetGenerator, ModelPredictor, ModelTrainer
 from ml2p.docker import ml2p_docker
 from ml2p.errors import ClientError, ServerError
 
+from .test_core import FakeArray
+
 
 def assert_cli_result(result, output, exit_code=0, exception=None, starts_with=False):
     """Assert that a CliRunner invocation returned the expected results."""
@@ -109,11 +113,15 @@ class UnhappyModelTrainer(ModelTrainer):
 
 class HappyModelPredictor(ModelPredictor):
     setup_called = False
+    teardown_called = False
 
     def setup(self):
         logging.info("So much set up to do!")
         self.setup_called = True
 
+    def teardown(self):
+        self.teardown_called = True
+
     def result(self, data):
         logging.info("These predictions are going to be great!")
         if "client_error" in data:
@@ -124,6 +132,10 @@ class HappyModelPredictor(ModelPredictor):
             raise APIException(data["flask_api_error"])
         if "generic_error" in data:
             raise Exception(data["generic_error"])
+        if "array" in data:
+            return {"array": FakeArray(data["array"])}
+        if "unserializable" in data:
+            return {"unserializable": object()}
         return {"probability": 0.5, "input": data["input"]}
 
 
@@ -149,6 +161,20 @@ class DummyApp:
         self._runs.append((args, kw))
 
 
+class DummyServer:
+    """A dummy gunicorn server."""
+
+    def __init__(self, servers):
+        self._servers = servers
+
+    def __call__(self, app, options):
+        self._servers.append((app, options))
+        return self
+
+    def run(self):
+        pass
+
+
 class TestML2PDocker:
     def test_help(self):
         runner = CliRunner()
@@ -172,6 +198,18 @@ class TestML2PDocker:
         ]
 
 
+class TestML2PDockerServerNames:
+    def test_server_names(self):
+        assert ml2p.docker.app is ml2p.docker_server.app
+        assert ml2p.docker.ML2PAPI is ml2p.docker_server.ML2PAPI
+        assert ml2p.docker.ML2PServer is ml2p.docker_server.ML2PServer
+
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError) as err:
+            ml2p.docker.unknown
+        assert str(err.value) == "module 'ml2p.docker' has no attribute 'unknown'"
+
+
 class TestML2PDockerTrain:
     def check_train(self, *args, **kw):
         return invoke_and_check_command("train", *args, **kw)
@@ -254,18 +292,21 @@ class TestML2PDockerTrain:
 
 
 docker_serve_type = collections.namedtuple(
-    "docker_serve_type", ["app", "teardowns", "runs"]
+    "docker_serve_type", ["app", "signals", "runs", "servers"]
 )
 
 
 @pytest.fixture
 def docker_serve(monkeypatch):
-    teardowns = []
+    signals = []
     runs = []
+    servers = []
     app = DummyApp(runs)
-    monkeypatch.setattr(atexit, "register", teardowns.append)
-    monkeypatch.setattr(ml2p.docker, "app", app)
-    return docker_serve_type(app=app, teardowns=teardowns, runs=runs)
+    monkeypatch.setattr(signal, "signal", lambda *args: signals.append(args))
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(ml2p.docker_server, "app", app)
+    monkeypatch.setattr(ml2p.docker_server, "ML2PServer", DummyServer(servers))
+    return docker_serve_type(app=app, signals=signals, runs=runs, servers=servers)
 
 
 class TestML2PDockerServe:
@@ -297,10 +338,88 @@ class TestML2PDockerServe:
         assert isinstance(docker_serve.app.predictor, HappyModelPredictor)
         assert docker_serve.app.predictor.env.model_folder() == env.model_folder()
         assert docker_serve.app.predictor.setup_called
-        assert docker_serve.teardowns == [docker_serve.app.predictor.teardown]
+        assert docker_serve.signals == []
+        assert docker_serve.runs == []
+        [(app, options)] = docker_serve.servers
+        post_fork = options.pop("post_fork")
+        on_exit = options.pop("on_exit")
+        assert app is docker_serve.app
+        assert options == {
+            "bind": "0.0.0.0:8080",
+            "workers": 2,
+            "worker_class": "gthread",
+            "threads": 4,
+            "preload_app": True,
+        }
+        s3_client = docker_serve.app.predictor.s3_client
+        post_fork(None, None)
+        assert docker_serve.app.predictor.s3_client is not s3_client
+        executor = docker_serve.app.predictor._get_batch_executor()
+        assert not docker_serve.app.predictor.teardown_called
+        on_exit(None)
+        assert docker_serve.app.predictor.teardown_called
+        assert docker_serve.app.predictor._batch_executor is None
+        with pytest.raises(RuntimeError):
+            executor.submit(print)
+
+    def test_serve_with_workers_and_threads(self, docker_serve, sagemaker):
+        sagemaker.serve()
+        self.check_serve(
+            [
+                "Starting server for model version test-model-1.2.3.",
+                "So much set up to do!",
+                "Done.",
+            ],
+            args=["--workers", "3", "--threads", "8"],
+            sagemaker=sagemaker,
+            model=HappyModel,
+        )
+        [(_, options)] = docker_serve.servers
+        assert options["workers"] == 3
+        assert options["threads"] == 8
+
+    def test_serve_with_workers_and_threads_from_environ(
+        self, docker_serve, sagemaker, monkeypatch
+    ):
+        sagemaker.serve()
+        monkeypatch.setenv("SAGEMAKER_GUNICORN_WORKERS", "5")
+        monkeypatch.setenv("SAGEMAKER_GUNICORN_THREADS", "2")
+        self.check_serve(
+            [
+                "Starting server for model version test-model-1.2.3.",
+                "So much set up to do!",
+                "Done.",
+            ],
+            sagemaker=sagemaker,
+            model=HappyModel,
+        )
+        [(_, options)] = docker_serve.servers
+        assert options["workers"] == 5
+        assert options["threads"] == 2
+
+    def test_serve_debug(self, docker_serve, sagemaker):
+        sagemaker.serve()
+        self.check_serve(
+            [
+                "Starting server for model version test-model-1.2.3.",
+                "So much set up to do!",
+                "Done.",
+            ],
+            args=["--debug"],
+            sagemaker=sagemaker,
+            model=HappyModel,
+        )
+        assert docker_serve.servers == []
         assert docker_serve.runs == [
-            ((), {"host": "0.0.0.0", "port": 8080, "debug": False})
+            ((), {"host": "0.0.0.0", "port": 8080, "debug": True})
         ]
+        assert docker_serve.signals == [(signal.SIGTERM, ml2p.docker.exit_on_sigterm)]
+        assert docker_serve.app.predictor.teardown_called
+
+    def test_exit_on_sigterm(self):
+        with pytest.raises(SystemExit) as err:
+            ml2p.docker.exit_on_sigterm(signal.SIGTERM, None)
+        assert err.value.code == 0
 
     def test_serve_model_passed_via_hyperparameters(self, docker_serve, sagemaker):
         sagemaker.serve(ML2P_MODEL_CLS=model_cls_path(HappyModel))
@@ -333,106 +452,26 @@ class TestML2PDockerServe:
         )
 
 
-@pytest.fixture
-def api_client(sagemaker):
-    app = ml2p.docker.app
-    app.config["TESTING"] = True
-    app.predictor = HappyModelPredictor(sagemaker.serve())
-    app.predictor.setup()
-    client = app.test_client()
-
-    yield client
-
-    app.predictor.teardown()
-    del app.predictor
-    del app.config["TESTING"]
-
-
-class TestAPI:
-    def test_ping(self, api_client):
-        response = api_client.get("/ping")
-        assert response.status_code == 200
-        assert response.content_type == "application/json"
-        assert response.get_json() == {
-            "model_version": "test-model-1.2.3",
-            "ml2p_version": str(ml2p_version),
-        }
-
-    def test_invocations(self, api_client, fake_utcnow):
-        response = api_client.post("/invocations", json={"input": 12345})
-        assert response.status_code == 200
-        assert response.content_type == "application/json"
-        assert response.get_json() == {
-            "metadata": {
-                "model_version": "test-model-1.2.3",
-                "ml2p_version": str(ml2p_version),
-                "timestamp": fake_utcnow.timestamp(),
-            },
-            "result": {"probability": 0.5, "input": 12345},
-        }
-
-    def test_batch_invocations(self, api_client, fake_utcnow):
-        response = api_client.post(
-            "/invocations", json={"instances": [{"input": 12345}, {"input": 12346}]}
-        )
-        assert response.status_code == 200
-        assert response.content_type == "application/json"
-        assert response.get_json() == {
-            "predictions": [
-                {
-                    "metadata": {
-                        "model_version": "test-model-1.2.3",
-                        "ml2p_version": str(ml2p_version),
-                        "timestamp": fake_utcnow.timestamp(),
-                    },
-                    "result": {"probability": 0.5, "input": 12345},
-                },
-                {
-                    "metadata": {
-                        "model_version": "test-model-1.2.3",
-                        "ml2p_version": str(ml2p_version),
-                        "timestamp": fake_utcnow.timestamp(),
-                    },
-                    "result": {"probability": 0.5, "input": 12346},
-                },
-            ]
-        }
-
-    def test_invocation_with_generic_error(self, api_client, fake_utcnow):
-        with pytest.raises(Exception) as err:
-            api_client.post("/invocations", json={"generic_error": "test error"})
-        assert str(err.value) == "test error"
-        assert err.value.__class__ is Exception
-
-    def test_invocation_with_flask_api_error(self, api_client, fake_utcnow):
-        response = api_client.post(
-            "/invocations", json={"flask_api_error": "message eep"}
+class TestPrefetchFiles:
+    def test_prefetch_files(self, tmp_path, monkeypatch):
+        advised = []
+        monkeypatch.setattr(
+            os, "posix_fadvise", lambda *args: advised.append(args), raising=False
         )
-        assert response.status_code == 500
-        assert response.content_type == "application/json"
-        assert response.get_json() == {"message": "message eep"}
-
-    def test_invocation_with_client_error(self, api_client, fake_utcnow):
-        response = api_client.post("/invocations", json={"client_error": "bad param"})
-        assert response.status_code == 400
-        assert response.content_type == "application/json"
-        assert response.get_json() == {"message": "client", "details": ["bad param"]}
-
-    def test_invocation_with_server_error(self, api_client, fake_utcnow):
-        response = api_client.post("/invocations", json={"server_error": "eep"})
-        assert response.status_code == 500
-        assert response.content_type == "application/json"
-        assert response.get_json() == {"message": "server", "details": ["eep"]}
-
-    def test_execution_parameters(self, api_client, fake_utcnow):
-        response = api_client.get("/execution-parameters")
-        assert response.status_code == 200
-        assert response.content_type == "application/json"
-        assert response.get_json() == {
-            "MaxConcurrentTransforms": 1,
-            "BatchStrategy": "MULTI_RECORD",
-            "MaxPayloadInMB": 6,
-        }
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "weights.bin").write_bytes(b"weights")
+        (tmp_path / "model.json").write_text("{}")
+        ml2p.docker.prefetch_files(tmp_path)
+        assert len(advised) == 2
+        assert all(args[1:] == (0, 0, os.POSIX_FADV_WILLNEED) for args in advised)
+
+    def test_prefetch_files_without_fadvise(self, tmp_path, monkeypatch):
+        monkeypatch.delattr(os, "posix_fadvise", raising=False)
+        (tmp_path / "model.json").write_text("{}")
+        ml2p.docker.prefetch_files(tmp_path)
+
+    def test_prefetch_missing_folder(self, tmp_path):
+        ml2p.docker.prefetch_files(tmp_path / "missing")
 
 
 class TestML2PDockerGenerateDataset:
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+""" Tests for ml2p.docker_server. """
+
+import datetime
+import decimal
+
+import pytest
+
+import ml2p.docker_server
+from ml2p import __version__ as ml2p_version
+
+from .test_core import FakeArray
+from .test_docker import HappyModelPredictor
+
+
+class StreamingModelPredictor(HappyModelPredictor):
+    def stream_batch_result(self, data):
+        for datum in data:
+            yield self.result(datum)
+
+
+class TestML2PServer:
+    def test_config_and_load(self):
+        app = object()
+        server = ml2p.docker_server.ML2PServer(
+            app, {"bind": "127.0.0.1:9999", "workers": 3, "worker_class": "gthread"}
+        )
+        assert server.cfg.bind == ["127.0.0.1:9999"]
+        assert server.cfg.workers == 3
+        assert server.cfg.worker_class_str == "gthread"
+        assert server.load() is app
+
+
+class TestML2PJSONProvider:
+    def test_default(self):
+        provider = ml2p.docker_server.ML2PJSONProvider(ml2p.docker_server.app)
+        assert provider.dumps({"a": FakeArray([1, 2])}) == '{"a": [1, 2]}'
+
+    def test_default_unsupported(self):
+        provider = ml2p.docker_server.ML2PJSONProvider(ml2p.docker_server.app)
+        with pytest.raises(TypeError):
+            provider.dumps({"a": object()})
+
+
+class TestML2POrjsonProvider:
+    @pytest.fixture
+    def provider(self):
+        pytest.importorskip("orjson")
+        return ml2p.docker_server.ML2POrjsonProvider(ml2p.docker_server.app)
+
+    def test_app_uses_orjson(self, provider):
+        assert isinstance(ml2p.docker_server.app.json, type(provider))
+
+    def test_dumps(self, provider):
+        data = {"a": FakeArray([1, 2]), "b": decimal.Decimal("1.5"), 3: None}
+        assert provider.dumps(data) == '{"a":[1,2],"b":"1.5","3":null}'
+
+    def test_dumps_unsupported(self, provider):
+        with pytest.raises(TypeError):
+            provider.dumps({"a": object()})
+
+    def test_dumps_datetime(self, provider):
+        data = {"a": datetime.datetime(2019, 1, 31, 12, 0, 2)}
+        assert provider.dumps(data) == '{"a":"Thu, 31 Jan 2019 12:00:02 GMT"}'
+
+    def test_dumps_differences_from_json_provider(self, provider):
+        json_provider = ml2p.docker_server.ML2PJSONProvider(ml2p.docker_server.app)
+        data = {
+            "b": datetime.date(2019, 1, 31),
+            "a": [float("nan"), float("inf"), 1e16],
+        }
+        assert json_provider.dumps(data) == (
+            '{"a": [NaN, Infinity, 1e+16], "b": "Thu, 31 Jan 2019 00:00:00 GMT"}'
+        )
+        assert provider.dumps(data) == (
+            '{"b":"Thu, 31 Jan 2019 00:00:00 GMT","a":[null,null,1e16]}'
+        )
+
+    def test_loads(self, provider):
+        assert provider.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+        assert provider.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_response(self, provider):
+        response = provider.response({"a": 1})
+        assert response.content_type == "application/json"
+        assert response.get_data() == b'{"a":1}\n'
+
+
+@pytest.fixture(params=["ML2PJSONProvider", "ML2POrjsonProvider"])
+def api_client(request, sagemaker, monkeypatch):
+    app = ml2p.docker_server.app
+    if request.param == "ML2POrjsonProvider":
+        pytest.importorskip("orjson")
+    provider_cls = getattr(ml2p.docker_server, request.param)
+    monkeypatch.setattr(app, "json", provider_cls(app))
+    app.config["TESTING"] = True
+    app.predictor = HappyModelPredictor(sagemaker.serve())
+    app.predictor.setup()
+    client = app.test_client()
+
+    yield client
+
+    app.predictor.teardown()
+    del app.predictor
+    del app.config["TESTING"]
+
+
+class TestAPI:
+    def test_ping(self, api_client):
+        response = api_client.get("/ping")
+        assert response.status_code == 200
+        assert response.content_type == "application/json"
+        assert response.get_json() == {
+            "model_version": "test-model-1.2.3",
+            "ml2p_version": str(ml2p_version),
+        }
+
+    def test_ping_after_model_version_change(self, api_client):
+        assert api_client.get("/ping").get_json()["model_version"] == (
+            "test-model-1.2.3"
+        )
+        ml2p.docker_server.app.predictor.env.model_version = "test-model-2.0.0"
+        response = api_client.get("/ping")
+        assert response.get_json()["model_version"] == "test-model-2.0.0"
+
+    def test_invocations(self, api_client, fake_utcnow):
+        response = api_client.post("/invocations", json={"input": 12345})
+        assert response.status_code == 200
+        assert response.content_type == "application/json"
+        assert response.get_json() == {
+            "metadata": {
+                "model_version": "test-model-1.2.3",
+                "ml2p_version": str(ml2p_version),
+                "timestamp": fake_utcnow.timestamp(),
+            },
+            "result": {"probability": 0.5, "input": 12345},
+        }
+
+    def test_batch_invocations(self, api_client, fake_utcnow):
+        response = api_client.post(
+            "/invocations", json={"instances": [{"input": 12345}, {"input": 12346}]}
+        )
+        assert response.status_code == 200
+        assert response.content_type == "application/json"
+        assert response.get_json() == {
+            "predictions": [
+                {
+                    "metadata": {
+                        "model_version": "test-model-1.2.3",
+                        "ml2p_version": str(ml2p_version),
+                        "timestamp": fake_utcnow.timestamp(),
+                    },
+                    "result": {"probability": 0.5, "input": 12345},
+                },
+                {
+                    "metadata": {
+                        "model_version": "test-model-1.2.3",
+                        "ml2p_version": str(ml2p_version),
+                        "timestamp": fake_utcnow.timestamp(),
+                    },
+                    "result": {"probability": 0.5, "input": 12346},
+                },
+            ]
+        }
+
+    def test_streamed_batch_invocations(self, api_client, sagemaker, fake_utcnow):
+        instances = {"instances": [{"input": 12345}, {"input": 12346}]}
+        expected = api_client.post("/invocations", json=instances).get_json()
+        app = ml2p.docker_server.app
+        app.predictor = StreamingModelPredictor(sagemaker.serve())
+        response = api_client.post("/invocations", json=instances)
+        assert response.status_code == 200
+        assert response.content_type == "application/json"
+        assert response.is_streamed
+        assert response.get_json() == expected
+
+    def test_streamed_batch_invocations_empty(self, api_client, sagemaker):
+        app = ml2p.docker_server.app
+        app.predictor = StreamingModelPredictor(sagemaker.serve())
+        response = api_client.post("/invocations", json={"instances": []})
+        assert response.status_code == 200
+        assert response.get_json() == {"predictions": []}
+
+    def test_streamed_batch_invocations_with_error(self, api_client, sagemaker):
+        app = ml2p.docker_server.app
+        app.predictor = StreamingModelPredictor(sagemaker.serve())
+        response = api_client.post(
+            "/invocations", json={"instances": [{"client_error": "bad param"}]}
+        )
+        assert response.status_code == 400
+        assert response.get_json() == {"message": "client", "details": ["bad param"]}
+
+    def test_invocation_with_array_result(self, api_client, fake_utcnow):
+        response = api_client.post("/invocations", json={"array": [1, 2, 3]})
+        assert response.status_code == 200
+        assert response.get_json()["result"] == {"array": [1, 2, 3]}
+
+    def test_invocation_with_unserializable_result(self, api_client):
+        with pytest.raises(TypeError):
+            api_client.post("/invocations", json={"unserializable": True})
+
+    def test_invocation_with_generic_error(self, api_client, fake_utcnow):
+        with pytest.raises(Exception) as err:
+            api_client.post("/invocations", json={"generic_error": "test error"})
+        assert str(err.value) == "test error"
+        assert err.value.__class__ is Exception
+
+    def test_invocation_with_flask_api_error(self, api_client, fake_utcnow):
+        response = api_client.post(
+            "/invocations", json={"flask_api_error": "message eep"}
+        )
+        assert response.status_code == 500
+        assert response.content_type == "application/json"
+        assert response.get_json() == {"message": "message eep"}
+
+    def test_invocation_with_client_error(self, api_client, fake_utcnow):
+        response = api_client.post("/invocations", json={"client_error": "bad param"})
+        assert response.status_code == 400
+        assert response.content_type == "application/json"
+        assert response.get_json() == {"message": "client", "details": ["bad param"]}
+
+    def test_invocation_with_server_error(self, api_client, fake_utcnow):
+        response = api_client.post("/invocations", json={"server_error": "eep"})
+        assert response.status_code == 500
+        assert response.content_type == "application/json"
+        assert response.get_json() == {"message": "server", "details": ["eep"]}
+
+    def test_invocation_without_json_content_type(self, api_client, fake_utcnow):
+        response = api_client.post(
+            "/invocations", data='{"input": 1}', content_type="text/plain"
+        )
+        assert response.status_code == 200
+        assert response.get_json()["result"] == {"probability": 0.5, "input": 1}
+
+    def test_invocation_with_invalid_json(self, api_client):
+        response = api_client.post(
+            "/invocations", data="{not json", content_type="application/json"
+        )
+        assert response.status_code == 400
+        assert response.content_type == "application/json"
+        assert list(response.get_json()) == ["message"]
+
+    def test_unknown_route(self, api_client):
+        response = api_client.get("/unknown")
+        assert response.status_code == 404
+        assert response.content_type == "application/json"
+        assert list(response.get_json()) == ["message"]
+
+    def test_method_not_allowed(self, api_client):
+        response = api_client.get("/invocations")
+        assert response.status_code == 405
+        assert response.content_type == "application/json"
+        assert set(response.headers["Allow"].split(", ")) == {"OPTIONS", "POST"}
+        assert list(response.get_json()) == ["message"]
+
+    def test_execution_parameters(self, api_client, fake_utcnow):
+        response = api_client.get("/execution-parameters")
+        assert response.status_code == 200
+        assert response.content_type == "application/json"
+        assert response.get_json() == {
+            "MaxConcurrentTransforms": 1,
+            "BatchStrategy": "MULTI_RECORD",
+            "MaxPayloadInMB": 6,
+        }
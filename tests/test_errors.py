@@ -2,7 +2,7 @@
 
 """ Tests for ml2p.errors. """
 
-from flask_api.exceptions import APIException
+from werkzeug.exceptions import HTTPException
 
 from ml2p.errors import APIError, ClientError, ServerError
 
@@ -10,11 +10,13 @@ from ml2p.errors import APIError, ClientError, ServerError
 class TestAPIError:
     def test_defaults(self):
         err = APIError(message="Test error")
-        assert isinstance(err, APIException)
+        assert isinstance(err, HTTPException)
         assert isinstance(err, APIError)
         assert err.message == "Test error"
         assert err.details == []
         assert err.status_code == 500
+        assert err.code == 500
+        assert err.description == "Test error"
 
     def test_details_str(self):
         err = APIError(message="Test error", details="zoom")
@@ -27,12 +29,13 @@ class TestAPIError:
     def test_status_code(self):
         err = APIError(message="Test error", status_code=501)
         assert err.status_code == 501
+        assert err.code == 501
 
 
 class TestClientError:
     def test_defaults(self):
         err = ClientError(message="Test client error")
-        assert isinstance(err, APIException)
+        assert isinstance(err, HTTPException)
         assert isinstance(err, APIError)
         assert err.message == "Test client error"
         assert err.status_code == 400
@@ -41,7 +44,7 @@ class TestClientError:
 class TestServerError:
     def test_defaults(self):
         err = ServerError(message="Test client error")
-        assert isinstance(err, APIException)
+        assert isinstance(err, HTTPException)
         assert isinstance(err, APIError)
         assert err.message == "Test client error"
         assert err.status_code == 500